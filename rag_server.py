@@ -31,6 +31,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from langchain_milvus import Milvus
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
@@ -233,19 +234,15 @@ def initialize_rag_system(args):
     
     print("Initializing RAG system...")
 
-    # Ensure .env from current working directory is loaded at runtime when
-    # running via tools like `uv run --with ...` since import-time loading may
-    # not always pick up the project .env in every execution environment.
-    _env_path_runtime = find_dotenv(usecwd=True)
-    if _env_path_runtime:
-        load_dotenv(_env_path_runtime, override=False)
+    # The project .env was already discovered and loaded at import time; reuse
+    # that cached path instead of re-walking the filesystem and re-parsing the
+    # file on every initialization.
 
     # Debug: reveal whether we picked up .env paths and whether the keys are present
     try:
         logger.debug(
-            "import-time .env path=%s; runtime .env path=%s; OPENAI_API_KEY in env=%s; API_SECRET in env=%s",
-            _env_path if '_env_path' in globals() else None,
-            _env_path_runtime,
+            "import-time .env path=%s; OPENAI_API_KEY in env=%s; API_SECRET in env=%s",
+            _env_path,
             ("OPENAI_API_KEY" in os.environ),
             ("API_SECRET" in os.environ or "OPENAI_API_SECRET" in os.environ),
         )
@@ -256,7 +253,7 @@ def initialize_rag_system(args):
     # project's .env file (useful when load_dotenv didn't modify os.environ for any reason).
     if "OPENAI_API_KEY" not in os.environ and not args.openai_api_key:
         from dotenv import dotenv_values
-        values = dotenv_values(_env_path_runtime or '')
+        values = dotenv_values(_env_path or '')
         if values and values.get("OPENAI_API_KEY"):
             os.environ["OPENAI_API_KEY"] = values.get("OPENAI_API_KEY")
 
@@ -412,8 +409,8 @@ async def health():
     return {"status": "healthy", "rag_initialized": base_qa is not None}
 
 
-@app.post("/v1/chat/completions", response_model=ChatCompletionResponse)
-async def chat_completions(request: ChatCompletionRequest, fastapi_request: Request):
+@app.post("/v1/chat/completions")
+async def chat_completions(request: ChatCompletionRequest, fastapi_request: Request) -> ORJSONResponse:
     """
     OpenAI-compatible chat completion endpoint.
     
@@ -483,55 +480,44 @@ async def chat_completions(request: ChatCompletionRequest, fastapi_request: Requ
             temp_chain.invoke,
             question
         )
-        result = ai_message_to_chat_completion(result)  # openai format dict.
-        # Ensure the returned model name is set sensibly when missing
-        if isinstance(result, dict) and (not result.get("model") or result.get("model") == "unknown"):
-            result["model"] = request.model or getattr(app.state.args, "model_name", "unknown")
-        # Assume dict return is guaranteed; return it directly and let FastAPI validate.
-        return result
+        # Pre-serialized OpenAI-format ORJSONResponse; bypasses FastAPI's
+        # response-model validation/serialization on the hot path.
+        return ai_message_to_chat_completion(
+            result,
+            model=request.model or getattr(app.state.args, "model_name", None),
+        )
 
     except Exception as e:
         # Log the original pipeline error and any forwarding error without full traceback
         # (avoid noisy stack traces for expected pipeline errors; enable DEBUG to see full details)
         logger.error(f"pipeline invocation failed: {e}")
-        # No retriever-based fallback per user request — echo the user's question
-        choices = [
-            ChatCompletionChoice(
-                index=0,
-                message=Message(role="assistant", content=str(e)),
-                finish_reason="error",
-            )
-        ]
-        usage = Usage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
-
-    # Create OpenAI-compatible response
-    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
-    created_timestamp = int(time.time())
-    
-    response = ChatCompletionResponse(
-        id=completion_id,
-        object="chat.completion",
-        created=created_timestamp,
-        model=request.model or "gpt-3.5-turbo",
-        choices=choices,
-        usage=usage,
-    )
-    
-    return response
+        # No retriever-based fallback per user request — echo the error as the
+        # assistant message in an OpenAI-compatible payload.
+        return ORJSONResponse({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.model or "gpt-3.5-turbo",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": str(e)},
+                "finish_reason": "error",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
 
 
 def main():
     """Main entry point for the application."""
     import uvicorn
     
-    # Load environment variables from the project's .env (prefer CWD),
-    # ensuring CLI defaults (parse_args) see project .env when running via `uv run`.
-    _env_path_main = find_dotenv(usecwd=True)
-    if _env_path_main:
-        # Force-load project .env so that running via `uv run --with ...` picks up
-        # project environment values (override existing env vars if necessary).
-        print(f"LOADING .env from project path: {_env_path_main}")
-        load_dotenv(_env_path_main, override=True)
+    # Re-apply the project .env discovered at import time with override=True so
+    # that running via `uv run --with ...` picks up project environment values
+    # even when they were already set. The path is cached at module level, so
+    # no second find_dotenv() filesystem walk is needed here.
+    if _env_path:
+        print(f"LOADING .env from project path: {_env_path}")
+        load_dotenv(_env_path, override=True)
     else:
         print("No project .env found via find_dotenv(); falling back to default load_dotenv()")
         load_dotenv()
@@ -542,13 +528,23 @@ def main():
     
     # Store args in app state so they're accessible in lifespan
     app.state.args = args
-    
+
+    # Use uvloop + httptools instead of the default asyncio + h11 stack; both
+    # are compiled and give a measurable throughput win. Install the policy
+    # and assert it took so a silent fallback to asyncio can't hide a regression.
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    assert asyncio.get_event_loop_policy().__class__.__module__.startswith("uvloop")
+
     # Run the server with uvicorn
     print(f"Starting server on {args.host}:{args.port}")
     uvicorn.run(
         app,
         host=args.host,
         port=args.port,
+        loop="uvloop",
+        http="httptools",
     )
 
 
@@ -1,41 +1,140 @@
+import re
 import time
-def ai_message_to_chat_completion(m): #is langchain.messages.AIMessage
-    g = lambda o, k, d=None: o.get(k, d) if isinstance(o, dict) else getattr(o, k, d)
-    d = lambda o: o if isinstance(o, dict) else (getattr(o, "dict", lambda: {})() if o else {})
+from operator import itemgetter
+from typing import Any, Optional
 
-    try:
-        rm, um = d(g(m, "response_metadata")), d(g(m, "usage_metadata"))
-        tk = d(rm.get("token_usage"))
-        p = tk.get("prompt_tokens", um.get("input_tokens", 0))
-        c = tk.get("completion_tokens", um.get("output_tokens", 0))
-        t = tk.get("total_tokens", p + c)
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
-        return {
-            "id": rm.get("id") or g(m, "id") or f"chatcmpl-{int(time.time()*1e3)}",
-            "object": "chat.completion",
-            "created": int(time.time()),
-            "model": rm.get("model_name", "unknown"),
-            "choices": [{
-                "index": 0,
-                "message": {"role": "assistant", "content": g(m, "content")},
-                "finish_reason": rm.get("finish_reason", "stop"),
-                "logprobs": rm.get("logprobs")
-            }],
-            "usage": {"prompt_tokens": p, "completion_tokens": c, "total_tokens": t},
-        }
+_time = time.time  # skip the module attribute lookup on the hot path
+
+
+class AIMessageShape(BaseModel):
+    """Minimal shape of a langchain.messages.AIMessage (or equivalent dict)."""
+    model_config = ConfigDict(extra="ignore")
+
+    id: Optional[str] = None
+    content: Any = None
+    response_metadata: Optional[dict] = None
+    usage_metadata: Optional[dict] = None
+
+
+# Built once at import time; validate_python(..., from_attributes=True) handles
+# both dicts and AIMessage objects in a single pydantic-core pass.
+_ADAPTER = TypeAdapter(AIMessageShape)
+
+# Strips repr-style metadata segments that leak into stringified messages
+# (e.g. "... additional_kwargs={} response_metadata={...}") in one pass.
+_META_RE = re.compile(r"\s*(?:additional_kwargs|response_metadata|usage_metadata|tool_calls)=\{[^}]*\}")
+
+
+def strip_meta(s: str) -> str:
+    return _META_RE.sub("", s).strip()
 
+
+# Prebuilt payload skeletons: dict.copy() on a template is one C-level pass
+# versus re-evaluating a multi-key dict literal per call. Only the varying
+# fields get written afterwards; mutable values are always overwritten.
+_RESP_TEMPLATE: dict[str, Any] = {
+    "id": "",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "unknown",
+    "choices": None,
+    "usage": None,
+}
+
+_CHOICE_TEMPLATE: dict[str, Any] = {
+    "index": 0,
+    "message": None,
+    "finish_reason": "stop",
+    "logprobs": None,
+}
+
+_MSG_TEMPLATE: dict[str, Any] = {"role": "assistant", "content": None}
+
+
+def _extract_choice(msg: AIMessageShape, index: int) -> tuple:
+    """Build one OpenAI choice dict plus its (prompt, completion) token counts."""
+    rm: dict = msg.response_metadata or {}
+    um: dict = msg.usage_metadata or {}
+    # token_usage lives inside response_metadata and is NOT adapter-validated;
+    # coerce non-dict values instead of letting .get() raise out of the helper.
+    tk = rm.get("token_usage")
+    tk = tk if isinstance(tk, dict) else {}
+    p = tk.get("prompt_tokens", um.get("input_tokens", 0))
+    c = tk.get("completion_tokens", um.get("output_tokens", 0))
+    content = msg.content
+    message = _MSG_TEMPLATE.copy()
+    message["content"] = strip_meta(content) if isinstance(content, str) else content
+    choice = _CHOICE_TEMPLATE.copy()
+    choice["index"] = index
+    choice["message"] = message
+    choice["finish_reason"] = rm.get("finish_reason", "stop")
+    choice["logprobs"] = rm.get("logprobs")
+    return (choice, p, c)
+
+
+def ai_message_to_chat_completion(m: Any, model: Optional[str] = None, choices: Optional[list] = None) -> ORJSONResponse: #m is langchain.messages.AIMessage
+    _t = _time(); _now = int(_t); _now_ms = int(_t * 1e3)
+    _is_dict = isinstance(m, dict)  # decided once; reused on every branch
+
+    # Fast path: already an OpenAI-shaped dict (e.g. a pass-through chain
+    # result). Patch the envelope fields in place and skip the whole pipeline.
+    if _is_dict and "choices" in m:
+        m.setdefault("id", f"chatcmpl-{_now_ms}")
+        m.setdefault("created", _now)
+        m.setdefault("object", "chat.completion")
+        m.setdefault("model", model or "unknown")
+        return ORJSONResponse(m)
+
+    # Only adapter validation can realistically fail; everything after it is
+    # dict work on validated data, with the unvalidated token_usage value
+    # coerced defensively, so the happy path runs without exception-driven
+    # control flow.
+    try:
+        msg = _ADAPTER.validate_python(m, from_attributes=True)
+        msgs = None if choices is None else [
+            _ADAPTER.validate_python(ch, from_attributes=True) for ch in choices
+        ]
     except Exception as e:
-        return {
-            "id": f"chatcmpl-error-{int(time.time()*1e3)}",
+        content = m.get("content", e) if _is_dict else getattr(m, "content", e)
+        return ORJSONResponse({
+            "id": f"chatcmpl-error-{_now_ms}",
             "object": "chat.completion",
-            "created": int(time.time()),
-            "model": "unknown",
+            "created": _now,
+            "model": model or "unknown",
             "choices": [{
                 "index": 0,
-                "message": {"role": "assistant", "content": str(g(m, "content", e))},
+                "message": {"role": "assistant", "content": str(content)},
                 "finish_reason": "stop",
                 "logprobs": None
             }],
             "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
             "error": {"message": str(e)}
-        }
+        })
+
+    rm: dict = msg.response_metadata or {}
+    if msgs is None:
+        extracted = [_extract_choice(msg, 0)]
+        # Single-choice path: trust the reported total when present.
+        tk = rm.get("token_usage")
+        tk = tk if isinstance(tk, dict) else {}
+        p, c = extracted[0][1], extracted[0][2]
+        t = tk.get("total_tokens", p + c)
+    else:
+        extracted = list(map(_extract_choice, msgs, range(len(msgs))))
+        p = sum(map(itemgetter(1), extracted))
+        c = sum(map(itemgetter(2), extracted))
+        t = p + c
+
+    out = _RESP_TEMPLATE.copy()
+    out["id"] = rm.get("id") or msg.id or f"chatcmpl-{_now_ms}"
+    out["created"] = _now
+    out["model"] = rm.get("model_name") or model or "unknown"
+    out["choices"] = list(map(itemgetter(0), extracted))
+    out["usage"] = {"prompt_tokens": p, "completion_tokens": c, "total_tokens": t}
+
+    # ORJSONResponse serializes via orjson.dumps and is returned to the client
+    # as-is, skipping FastAPI's response-model validation and jsonable_encoder.
+    return ORJSONResponse(out)